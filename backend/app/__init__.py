@@ -55,12 +55,16 @@ def _register_extensions(app: Flask) -> None:
     db.init_app(app)
     with app.app_context():
         register_models()
-        db.create_all()
     create_celery_app(app)
 
 
 def _register_cli(app: Flask) -> None:
     """Attach custom CLI commands."""
-    # Placeholder for Flask CLI command registration
-    return None
+
+    @app.cli.command("init-db")
+    def init_db() -> None:
+        """Create all database tables."""
+        from backend.app.extensions import db
+
+        db.create_all()
 
@@ -7,10 +7,12 @@ from .audio_loader import (
     EmptyAudioError,
     UnsupportedFormatError,
     load_audio,
+    looks_like_audio,
 )
 
 __all__ = [
     "load_audio",
+    "looks_like_audio",
     "AudioLoaderError",
     "AudioDecodeError",
     "AudioTooShortError",
@@ -0,0 +1,147 @@
+"""Real-FFT helper with optional FFTW backing.
+
+pyfftw is optional (like Essentia and numba); without it the helper
+falls through to np.fft.rfft. With it, plans are built once per frame
+size with FFTW_MEASURE and the resulting wisdom is persisted to disk,
+so later worker processes skip the measurement phase and start with
+SIMD-tuned plans.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import pyfftw
+
+    PYFFTW_AVAILABLE = True
+except ImportError:
+    pyfftw = None
+    PYFFTW_AVAILABLE = False
+
+try:
+    from scipy import fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+logger = logging.getLogger(__name__)
+
+WISDOM_PATH = os.getenv(
+    "FFTW_WISDOM_PATH",
+    os.path.join(tempfile.gettempdir(), "brainjelly_fftw_wisdom"),
+)
+
+# FFTW plan objects share their input/output buffers between calls, so
+# each thread keeps its own plans.
+_tls = threading.local()
+_wisdom_dirty = False
+
+
+# export_wisdom() is a tuple of three byte strings of FFTW wisdom text
+# (one per precision). They are NUL-free, so the file is simply the
+# three blobs NUL-joined — no pickle, which would execute arbitrary
+# code from a world-writable path at import time.
+def _load_wisdom() -> None:
+    try:
+        with open(WISDOM_PATH, "rb") as fh:
+            parts = fh.read().split(b"\0")
+    except OSError:
+        return
+    if len(parts) != 3:
+        return
+    pyfftw.import_wisdom(tuple(parts))
+    logger.debug("Loaded FFTW wisdom from %s", WISDOM_PATH)
+
+
+def _save_wisdom() -> None:
+    if not _wisdom_dirty:
+        return
+    try:
+        with open(WISDOM_PATH, "wb") as fh:
+            fh.write(b"\0".join(pyfftw.export_wisdom()))
+    except OSError:
+        logger.debug("Could not persist FFTW wisdom to %s", WISDOM_PATH)
+
+
+if PYFFTW_AVAILABLE:
+    _load_wisdom()
+    atexit.register(_save_wisdom)
+
+
+def _build_plan(n: int):
+    global _wisdom_dirty
+    plan = pyfftw.builders.rfft(
+        pyfftw.empty_aligned(n, dtype="float32"),
+        overwrite_input=True,
+        planner_effort="FFTW_MEASURE",
+        threads=1,
+    )
+    _wisdom_dirty = True
+    return plan
+
+
+@lru_cache(maxsize=16)
+def rfftfreqs(n: int, samplerate: int) -> np.ndarray:
+    """Cached float32 rfft bin frequencies for an (n, samplerate) pair.
+
+    Only a handful of frame-size/samplerate combinations ever occur, so
+    the arrays are built once per process and shared read-only across
+    tasks; setflags guards against a caller scribbling on the shared
+    buffer.
+    """
+    freqs = np.fft.rfftfreq(n, 1.0 / samplerate).astype(np.float32)
+    freqs.setflags(write=False)
+    return freqs
+
+
+def fast_len(n: int) -> int:
+    """Smallest FFT-friendly length >= n for a real transform.
+
+    Arbitrary lengths can land on a large prime factor, where pocketfft
+    degrades badly; padding to a 2/3/5/7-smooth length keeps it on the
+    vectorized radix kernels for at most a few percent of extra zeros.
+    Identity without scipy, where np.fft handles any length acceptably.
+    """
+    if scipy_fft is not None:
+        return scipy_fft.next_fast_len(n, real=True)
+    return n
+
+
+def rfft_long(x: np.ndarray, axis: int = -1, n: int | None = None) -> np.ndarray:
+    """Real FFT for full-length signals or batched frame matrices.
+
+    Per-frame transforms in a loop go through the planned rfft below;
+    this one is for one-shot transforms over whole waveforms or whole
+    (n_frames, n_fft) matrices, where scipy's pocketfft can spread the
+    work across cores (workers=-1) and keeps float32 input in single
+    precision instead of np.fft's float64 promotion. Pass ``n`` from
+    fast_len to zero-pad onto a smooth transform length.
+    """
+    if scipy_fft is not None:
+        return scipy_fft.rfft(x, n=n, axis=axis, workers=-1)
+    return np.fft.rfft(x, n=n, axis=axis)
+
+
+def rfft(x: np.ndarray) -> np.ndarray:
+    """Return the real FFT of a 1-D frame.
+
+    The returned array is the plan's shared output buffer when FFTW is
+    in use — consume it (e.g. take np.abs) before the next call from
+    the same thread.
+    """
+    if pyfftw is None:
+        return np.fft.rfft(x)
+    plans = getattr(_tls, "plans", None)
+    if plans is None:
+        plans = _tls.plans = {}
+    plan = plans.get(x.size)
+    if plan is None:
+        plan = plans[x.size] = _build_plan(x.size)
+    return plan(x)
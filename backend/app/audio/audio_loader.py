@@ -5,7 +5,6 @@ from __future__ import annotations
 import logging
 import os
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import Tuple
 
@@ -17,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 SUPPORTED_FORMATS = {".wav", ".mp3", ".aif", ".aiff", ".flac"}
 MIN_DURATION_SECONDS = 0.5
+AUDIOREAD_BLOCKSIZE = int(os.getenv("AUDIOREAD_BLOCKSIZE", str(64 * 1024)))
+SOUNDFILE_BLOCK_FRAMES = 65536
 
 
 class AudioLoaderError(Exception):
@@ -57,6 +58,11 @@ def load_audio(path: str | Path) -> Tuple[np.ndarray, int]:
         ("audioread", _load_with_audioread),
         ("ffmpeg", _load_with_ffmpeg),
     ]
+    preferred = _sniff_preferred_loader(source_path)
+    if preferred is None:
+        preferred = _probe_with_soundfile_info(source_path)
+    if preferred is not None:
+        loaders.sort(key=lambda item: item[0] != preferred)
 
     last_error: Exception | None = None
     for name, loader in loaders:
@@ -86,68 +92,193 @@ def load_audio(path: str | Path) -> Tuple[np.ndarray, int]:
     ) from last_error
 
 
+def looks_like_audio(path: str | Path) -> bool:
+    """Cheap header-only check that a file is plausibly decodable audio.
+
+    Matches the magic bytes of the supported containers, falling back
+    to a soundfile header parse for anything unrecognised. Never
+    decodes samples, so it is safe to call on the request path where a
+    full load_audio would hold a web worker for seconds.
+    """
+    source_path = Path(path)
+    if _sniff_preferred_loader(source_path) is not None:
+        return True
+    try:
+        sf.info(str(source_path))
+    except Exception:  # noqa: broad-except
+        return False
+    return True
+
+
+def _sniff_preferred_loader(path: Path) -> str | None:
+    """Map the file's magic bytes to the loader most likely to succeed.
+
+    The extension check above only looks at the filename; a renamed file
+    (e.g. a FLAC called .mp3) would otherwise burn time failing through
+    the wrong loaders before the right one runs.
+    """
+    try:
+        with open(path, "rb") as fh:
+            header = fh.read(12)
+    except OSError:
+        return None
+
+    if len(header) < 12:
+        return None
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "soundfile"
+    if header[:4] in (b"fLaC", b"OggS"):
+        return "soundfile"
+    if header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+        return "soundfile"
+    if header[:3] == b"ID3" or (header[0] == 0xFF and (header[1] & 0xE0) == 0xE0):
+        return "ffmpeg"
+    return None
+
+
+def _probe_with_soundfile_info(path: Path) -> str | None:
+    """Route by a cheap header-only probe when the signature is unknown.
+
+    sf.info parses just the container header (<1 ms): success means
+    libsndfile can decode the file directly, while a parse failure means
+    it never will, so the cascade should start at ffmpeg instead of
+    burning a failed soundfile and audioread attempt first.
+    """
+    try:
+        sf.info(str(path))
+    except sf.LibsndfileError:
+        return "ffmpeg"
+    except Exception:  # noqa: broad-except
+        return None
+    return "soundfile"
+
+
 def _load_with_soundfile(path: Path) -> Tuple[np.ndarray, int]:
-    data, samplerate = sf.read(path, dtype="float32", always_2d=False)
-    return np.asarray(data), int(samplerate)
+    with sf.SoundFile(str(path)) as handle:
+        frames = handle.frames
+        channels = handle.channels
+        if channels == 1:
+            out = np.empty(frames, dtype=np.float32)
+            data = handle.read(frames, out=out)
+            return data, int(handle.samplerate)
+
+        # Multichannel: decode block-wise into the preallocated mono
+        # buffer, downmixing as blocks arrive, so the full-length
+        # multichannel array never exists — peak memory is one mono
+        # track plus one block instead of channels x frames.
+        out = np.empty(frames, dtype=np.float32)
+        scale = np.float32(1.0 / channels)
+        filled = 0
+        while True:
+            block = handle.read(
+                SOUNDFILE_BLOCK_FRAMES, dtype="float32", always_2d=True
+            )
+            if block.shape[0] == 0:
+                break
+            out[filled : filled + block.shape[0]] = (
+                np.einsum("ij->i", block) * scale
+            )
+            filled += block.shape[0]
+        return out[:filled], int(handle.samplerate)
 
 
 def _load_with_audioread(path: Path) -> Tuple[np.ndarray, int]:
-    with audioread.audio_open(str(path)) as reader:
+    try:
+        # Some audioread backends accept a decode block size; larger blocks
+        # mean fewer read() syscalls per track.
+        reader_ctx = audioread.audio_open(str(path), block_size=AUDIOREAD_BLOCKSIZE)
+    except TypeError:
+        reader_ctx = audioread.audio_open(str(path))
+    with reader_ctx as reader:
         samplerate = reader.samplerate or 44100
-        buffers: list[np.ndarray] = []
+        channels = reader.channels or 1
+        # Preallocate from the reported duration and convert each int16
+        # block straight into the float32 output: np.multiply with
+        # casting='unsafe' fuses the cast and the scale in one SIMD
+        # pass, so neither a raw bytearray of the whole track nor an
+        # intermediate int16 array ever exists.
+        estimated = int((reader.duration or 0) * samplerate * channels)
+        out = np.empty(max(estimated, AUDIOREAD_BLOCKSIZE), dtype=np.float32)
+        scale = np.float32(1.0 / 32768.0)
+        filled = 0
         for chunk in reader:
-            if not chunk:
-                continue
-            np_chunk = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
-            buffers.append(np_chunk / 32768.0)
-        if not buffers:
+            src = np.frombuffer(chunk, dtype=np.int16)
+            end = filled + src.size
+            if end > out.size:
+                # Duration was an estimate; grow geometrically.
+                grown = np.empty(max(end, out.size * 2), dtype=np.float32)
+                grown[:filled] = out[:filled]
+                out = grown
+            np.multiply(src, scale, out=out[filled:end], casting="unsafe")
+            filled = end
+        if filled == 0:
             raise EmptyAudioError("audioread produced no samples")
-        audio = np.concatenate(buffers)
+        audio = out[:filled]
+        if channels > 1:
+            audio = audio.reshape(-1, channels)
         return audio, int(samplerate)
 
 
 def _load_with_ffmpeg(path: Path) -> Tuple[np.ndarray, int]:
     ffmpeg_binary = os.getenv("FFMPEG_BINARY", "ffmpeg")
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-    try:
-        cmd = [
-            ffmpeg_binary,
-            "-loglevel",
-            "error",
-            "-y",
-            "-i",
-            str(path),
-            "-ac",
-            "1",
-            "-ar",
-            "44100",
-            "-f",
-            "wav",
-            str(tmp_path),
-        ]
-        subprocess.run(cmd, check=True)
-        data, samplerate = sf.read(tmp_path, dtype="float32", always_2d=False)
-        return np.asarray(data), int(samplerate)
-    except subprocess.CalledProcessError as exc:
-        raise AudioDecodeError(f"ffmpeg failed to decode {path}") from exc
-    finally:
-        try:
-            tmp_path.unlink(missing_ok=True)
-        except OSError:
-            logger.debug("Failed to delete temp file %s", tmp_path, exc_info=True)
+    samplerate = 44100
+    cmd = [
+        ffmpeg_binary,
+        "-loglevel",
+        "error",
+        "-i",
+        str(path),
+        "-ac",
+        "1",
+        "-ar",
+        str(samplerate),
+        "-f",
+        "f32le",
+        "pipe:1",
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20,
+    )
+    raw, err = proc.communicate()
+    if proc.returncode != 0:
+        raise AudioDecodeError(
+            f"ffmpeg failed to decode {path}: {err.decode(errors='replace').strip()}"
+        )
+    audio = np.frombuffer(raw, dtype=np.float32)
+    return audio, samplerate
 
 
 def _post_process(audio: np.ndarray, samplerate: int) -> Tuple[np.ndarray, int]:
-    if audio.size == 0:
-        raise EmptyAudioError("Decoded audio is empty")
+    audio = _normalize_to_mono_f32(audio)
+    _validate_duration(audio, samplerate)
+    return audio, samplerate
+
+
+def _normalize_to_mono_f32(audio: np.ndarray) -> np.ndarray:
+    if audio.ndim == 1 and audio.dtype == np.float32:
+        # Fast path: every loader aims for mono float32 already.
+        return audio
 
     if audio.ndim > 1:
-        audio = np.mean(audio, axis=1)
+        n_channels = audio.shape[1]
+        if n_channels == 2:
+            audio = (audio[:, 0] + audio[:, 1]) * np.float32(0.5)
+        else:
+            # einsum sums in the input dtype, avoiding np.mean's float64
+            # intermediate.
+            audio = np.einsum("ij->i", audio) * np.float32(1.0 / n_channels)
 
-    audio = audio.astype(np.float32, copy=False)
-    duration = audio.size / float(samplerate)
+    return audio.astype(np.float32, copy=False)
 
+
+def _validate_duration(audio: np.ndarray, samplerate: int) -> None:
+    if audio.size == 0:
+        raise EmptyAudioError("Decoded audio is empty")
+
+    duration = audio.size / float(samplerate)
     if duration <= 0:
         raise EmptyAudioError("Decoded audio has zero duration")
     if duration < MIN_DURATION_SECONDS:
@@ -156,5 +287,3 @@ def _post_process(audio: np.ndarray, samplerate: int) -> Tuple[np.ndarray, int]:
             f"minimum {MIN_DURATION_SECONDS}s"
         )
 
-    return audio, samplerate
-
@@ -1,16 +1,569 @@
 """Essentia-based audio feature extraction."""
 
-ESSENTIA_AVAILABLE = False
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import queue
+import struct
+import threading
+from pathlib import Path
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import soundfile as sf
+
+from backend.app.audio._fft import rfft, rfftfreqs
+from backend.app.audio._spec_kernels import (
+    NUMBA_AVAILABLE,
+    peak_rms,
+    peak_rms_numpy,
+    spec_shape_means,
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 44100
+MFCC_FRAME_SIZE = 2048
+MFCC_HOP_SIZE = 1024
+ENVELOPE_FRAME_SIZE = 1024
+ENVELOPE_HOP_SIZE = 512
+N_SPECTRUM_BINS = MFCC_FRAME_SIZE // 2 + 1
+N_MELS = 40
+N_MFCC = 13
+
+# Stream plain mono 44.1 kHz WAVs in blocks so decode I/O overlaps with
+# the running time-domain stats; other layouts go through MonoLoader.
+STREAMING_DECODE = True
+DECODE_BLOCKSIZE = 65536
+
+# Derive the spectral centroid from the spectrogram the frame stage
+# already builds, instead of letting SpectralCentroidTime re-traverse
+# the whole signal. Flag kept for A/B rollback.
+USE_FUSED_CENTROID = True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_essentia():
+    """Import Essentia on first use and return its modules.
+
+    Essentia is a heavy native library (hundreds of ms of import time,
+    tens of MB of tables), so importing it lazily keeps workers that
+    never analyse audio from paying for it at boot. Returns a
+    (core, standard, streaming) tuple; all three are None when Essentia
+    is not installed, and streaming alone is None when only standard
+    mode is available.
+    """
+    try:
+        import essentia
+        import essentia.standard as standard
+    except ImportError:
+        return None, None, None
+    try:
+        import essentia.streaming as streaming
+    except ImportError:
+        streaming = None
+    return essentia, standard, streaming
+
+
+def essentia_available() -> bool:
+    """Report whether Essentia can be imported, importing it on demand."""
+    return _load_essentia()[1] is not None
+
+
+_tls = threading.local()
+
+
+def _algo(name: str, factory):
+    """Return a cached Essentia algorithm instance for the current thread.
+
+    Construction allocates FFT plans, window tables and filterbanks, so
+    repeated calls should reuse instances — but Essentia algorithms are
+    stateful, hence one cache per thread rather than per process.
+    """
+    instance = getattr(_tls, name, None)
+    if instance is None:
+        instance = factory()
+        setattr(_tls, name, instance)
+    return instance
+
+
+# Frozen template for the feature dict; mfcc is a tuple so sharing the
+# template across calls can't leak mutable state.
+_PLACEHOLDER = {
+    "spectral_centroid": None,
+    "rms": None,
+    "peak_amplitude": None,
+    "mfcc": (0.0,) * 13,
+    "spectral_flux": None,
+    "spectral_rolloff": None,
+    "spectral_flatness": None,
+    "rms_envelope": None,
+    "bpm": None,
+    "key": None,
+    "key_strength": None,
+}
+
+
+def _placeholder_features() -> dict:
+    """Return the feature dict shape with empty values."""
+    return dict(_PLACEHOLDER, mfcc=list(_PLACEHOLDER["mfcc"]))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_mono_cached(path: str, st_mtime_ns: int, st_size: int) -> np.ndarray:
+    """Decode a file to mono float32, keyed on (path, mtime, size)."""
+    _, es, _ = _load_essentia()
+    loader = es.MonoLoader(filename=path, sampleRate=SAMPLE_RATE)
+    return loader()
+
+
+def _load_mono(path: Path) -> np.ndarray:
+    """Return cached decoded audio, invalidating when the file changes."""
+    stat = os.stat(path)
+    return _load_mono_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _extract_frames_block(
+    audio: np.ndarray, start: int, stop: int, S: np.ndarray, row: int
+) -> int:
+    """Window and FFT frames in [start, stop) into rows of S.
+
+    Uses the thread-local algorithm cache: instances are stateful and
+    must not be shared across threads.
+    """
+    _, es, _ = _load_essentia()
+    window = _algo("window", lambda: es.Windowing(type="hann"))
+
+    count = 0
+    for offset in range(start, stop, MFCC_HOP_SIZE):
+        frame = audio[offset : offset + MFCC_FRAME_SIZE]
+        if frame.size < MFCC_FRAME_SIZE:
+            break
+        # Planned FFTW transform when pyfftw is installed; np.abs copies
+        # the shared output buffer into the S row immediately.
+        S[row + count] = np.abs(rfft(window(frame)))
+        count += 1
+    return count
+
+
+def _extract_frames(audio: np.ndarray):
+    """Return (spectrogram, frame count) for the track.
+
+    Frames are independent, and Essentia releases the GIL in its C++
+    core, so long tracks split into per-worker slabs of contiguous
+    frames processed by a thread pool, each writing its rows of the
+    preallocated spectrogram.
+    """
+    if audio.size < MFCC_FRAME_SIZE:
+        return None, 0
+
+    total_frames = 1 + (audio.size - MFCC_FRAME_SIZE) // MFCC_HOP_SIZE
+    n_workers = min(os.cpu_count() or 1, total_frames)
+    S = np.empty((total_frames, N_SPECTRUM_BINS), dtype=np.float32)
+    if n_workers <= 1:
+        n_frames = _extract_frames_block(audio, 0, audio.size, S, 0)
+        return S[:n_frames], n_frames
+
+    per_worker = -(-total_frames // n_workers)
+    n_frames = 0
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                _extract_frames_block,
+                audio,
+                i * MFCC_HOP_SIZE,
+                (i + per_worker) * MFCC_HOP_SIZE,
+                S,
+                i,
+            )
+            for i in range(0, total_frames, per_worker)
+        ]
+        for future in futures:
+            n_frames += future.result()
+    return S[:n_frames], n_frames
+
+
+@functools.lru_cache(maxsize=4)
+def _mel_weights(sr: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Return the (n_bins, n_mels) triangular mel filterbank.
+
+    Cached at module scope: the matrix depends only on the analysis
+    parameters and is reused across every track.
+    """
+    n_bins = n_fft // 2 + 1
+    freqs = np.linspace(0.0, sr / 2.0, n_bins)
+    mel_max = 2595.0 * np.log10(1.0 + (sr / 2.0) / 700.0)
+    mel_points = np.linspace(0.0, mel_max, n_mels + 2)
+    hz_points = 700.0 * (10.0 ** (mel_points / 2595.0) - 1.0)
+    weights = np.zeros((n_bins, n_mels), dtype=np.float32)
+    for m in range(n_mels):
+        lower, center, upper = hz_points[m], hz_points[m + 1], hz_points[m + 2]
+        rising = (freqs - lower) / (center - lower)
+        falling = (upper - freqs) / (upper - center)
+        weights[:, m] = np.clip(np.minimum(rising, falling), 0.0, None)
+    return weights
+
+
+@functools.lru_cache(maxsize=4)
+def _dct_basis(n_mels: int, n_coeffs: int) -> np.ndarray:
+    """Return the (n_mels, n_coeffs) orthonormal DCT-II basis, cached."""
+    mel_index = np.arange(n_mels)
+    basis = np.cos(np.pi * np.outer(mel_index + 0.5, np.arange(n_coeffs)) / n_mels)
+    basis *= np.sqrt(2.0 / n_mels)
+    basis[:, 0] *= np.sqrt(0.5)
+    return basis.astype(np.float32)
+
+
+def _mfcc_from_spectrogram(S: np.ndarray) -> list[float]:
+    """Mean MFCC vector via batched mel projection and DCT.
+
+    One matmul maps all frame spectra onto the mel bands; the DCT is
+    linear, so averaging the log-mel energies first means a single
+    13-coefficient transform instead of one per frame.
+    """
+    mel_energies = S @ _mel_weights(SAMPLE_RATE, MFCC_FRAME_SIZE, N_MELS)
+    mean_log_mel = np.log(mel_energies + 1e-10).mean(axis=0)
+    mfcc = mean_log_mel @ _dct_basis(N_MELS, N_MFCC)
+    return mfcc.astype(float).tolist()
+
+
+def _sniff_wav(path: Path) -> int | None:
+    """Verify the RIFF/WAVE magic and return the header sample rate.
+
+    Reads 44 bytes with os.open/os.read — cheaper than constructing a
+    loader just to find out the file isn't actually a WAV. Returns None
+    for anything that doesn't carry a RIFF/WAVE signature.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            header = os.read(fd, 44)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+    if len(header) < 44 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    return struct.unpack_from("<I", header, 24)[0]
+
+
+def _stream_decode_stats(path: Path):
+    """Decode a WAV in blocks while accumulating RMS and peak.
+
+    A producer thread pushes soundfile blocks into a small queue and the
+    consumer keeps running sum-of-squares and max-abs accumulators, so
+    the time-domain stats are finished the moment the last block lands
+    and decode latency hides behind the arithmetic. Returns
+    (audio, rms, peak), or None when the file needs MonoLoader (not
+    mono 44.1 kHz, or the header is unreadable). A decode error
+    mid-file is raised, so the caller falls back rather than treating
+    the decoded prefix as the whole track.
+    """
+    try:
+        info = sf.info(str(path))
+    except Exception:  # noqa: broad-except
+        return None
+    if info.samplerate != SAMPLE_RATE or info.channels != 1:
+        return None
+
+    blocks: queue.Queue = queue.Queue(maxsize=4)
+
+    def _producer() -> None:
+        # A decode failure mid-file must not look like end-of-stream:
+        # hand the exception to the consumer so the caller falls back
+        # to MonoLoader instead of accepting a truncated waveform.
+        try:
+            for block in sf.blocks(
+                str(path), blocksize=DECODE_BLOCKSIZE, dtype="float32"
+            ):
+                blocks.put(block)
+        except Exception as exc:  # noqa: broad-except
+            blocks.put(exc)
+        else:
+            blocks.put(None)
+
+    producer = threading.Thread(target=_producer, daemon=True)
+    producer.start()
+
+    chunks: list[np.ndarray] = []
+    sum_squares = 0.0
+    peak = 0.0
+    while True:
+        block = blocks.get()
+        if block is None:
+            break
+        if isinstance(block, Exception):
+            producer.join()
+            raise block
+        chunks.append(block)
+        # .item() skips CPython's numeric-protocol dispatch for NumPy
+        # scalars.
+        sum_squares += np.dot(block, block).item()
+        peak = max(peak, np.abs(block).max().item())
+    producer.join()
+
+    if not chunks:
+        return None
+    audio = np.concatenate(chunks)
+    rms = float(np.sqrt(sum_squares / audio.size))
+    return audio, rms, peak
 
 
 def essentia_extraction(track_path):
     """
-    Placeholder for future Essentia DSP logic.
+    Extract DSP features from a WAV file using Essentia.
+
+    Returns a dict with keys:
+    bpm, key, key_strength, spectral_centroid, rms, mfcc, peak_amplitude
+
+    Returns an empty dict when Essentia is unavailable or the file
+    cannot be analysed.
+    """
+    if not essentia_available():
+        return {}
+
+    path = Path(track_path)
+    if path.suffix.lower() != ".wav":
+        logger.debug("Skipping non-WAV file for Essentia analysis: %s", path)
+        return {}
+
+    header_samplerate = _sniff_wav(path)
+    if header_samplerate is None:
+        logger.warning("Rejected %s: no RIFF/WAVE signature", path)
+        return {}
+
+    streamed = None
+    if STREAMING_DECODE:
+        try:
+            streamed = _stream_decode_stats(path)
+        except Exception:  # noqa: broad-except
+            logger.exception("Streaming decode failed for %s", path)
+
+    if streamed is not None:
+        audio, stream_rms, stream_peak = streamed
+    else:
+        try:
+            audio = _load_mono(path)
+        except Exception:  # noqa: broad-except
+            logger.exception("Essentia failed to decode %s", path)
+            return {}
+
+    if audio.size == 0:
+        logger.warning("Essentia decoded zero samples from %s", path)
+        return {}
+
+    # Every stage assumes a contiguous float32 buffer; enforce it once
+    # here rather than letting individual kernels re-cast (and silently
+    # promote to float64, doubling memory traffic).
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+
+    features = _placeholder_features()
+
+    # The heavy stages share only the immutable audio buffer and Essentia
+    # releases the GIL, so run them concurrently instead of back to back.
+    stages = {
+        "bpm": _run_bpm,
+        "key": _run_key,
+        "rms_envelope": _run_envelope,
+    }
+    if streamed is None:
+        stages["peak_rms"] = _run_peak_rms
+    if _load_essentia()[2] is not None:
+        # One streaming network computes centroid and MFCC in a single
+        # pass over the PCM instead of one each.
+        stages["spectral"] = _run_spectral_fused
+    else:
+        if not USE_FUSED_CENTROID:
+            stages["spectral_centroid"] = _run_centroid
+        stages["frames"] = _run_frame_features
+
+    max_workers = min(len(stages), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(stage, audio): name for name, stage in stages.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception:  # noqa: broad-except
+                logger.exception("%s extraction failed for %s", name, path)
+                continue
+            if name == "key":
+                features["key"], features["key_strength"] = result
+            elif name == "peak_rms":
+                features["peak_amplitude"], features["rms"] = result
+            elif name in ("spectral", "frames"):
+                if result is not None:
+                    features.update(result)
+            else:
+                features[name] = result
+
+    if streamed is not None:
+        # The streamed accumulators are exact full-signal values; prefer
+        # them over the fused network's per-frame aggregate.
+        features["rms"] = stream_rms
+        features["peak_amplitude"] = stream_peak
+
+    return features
+
 
-    Must return a dict with keys:
-    bpm, key, key_strength, spectral_centroid, energy, rms, mfcc, peak_amplitude
+def _init_batch_worker() -> None:
+    """Warm the per-process caches before batch work arrives.
 
-    For now, return an empty dict.
+    Paying the Essentia import and filterbank construction inside the
+    initializer keeps it off the critical path of the first file each
+    worker processes.
     """
-    return {}
+    _load_essentia()
+    _mel_weights(SAMPLE_RATE, MFCC_FRAME_SIZE, N_MELS)
+    _dct_basis(N_MELS, N_MFCC)
+
+
+def essentia_extraction_batch(paths: list) -> list[dict]:
+    """Extract features for many files, fanning out across processes.
+
+    Each worker process imports Essentia once and reuses its cached
+    algorithms and filterbanks across the files it handles, so batch
+    ingests amortise the per-process setup that a task-per-file split
+    would repeat. Results come back in input order.
+    """
+    if not paths:
+        return []
+    if len(paths) == 1:
+        return [essentia_extraction(paths[0])]
+
+    max_workers = min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_batch_worker
+    ) as executor:
+        return list(executor.map(essentia_extraction, paths, chunksize=4))
+
+
+def _run_spectral_fused(audio: np.ndarray) -> dict:
+    """Compute spectral centroid, MFCC and shape in one pass over the PCM.
+
+    Wires an essentia.streaming network (FrameCutter into Windowing ->
+    Spectrum -> Centroid/MFCC/shape) so the C++ runtime walks the buffer
+    once, instead of each algorithm re-traversing it. RMS and peak come
+    from the fused time-domain kernel instead.
+    """
+    core, _, ess = _load_essentia()
+    pool = core.Pool()
+    vector_input = ess.VectorInput(audio)
+    frame_cutter = ess.FrameCutter(
+        frameSize=MFCC_FRAME_SIZE, hopSize=MFCC_HOP_SIZE, startFromZero=True
+    )
+    windowing = ess.Windowing(type="hann")
+    spectrum = ess.Spectrum()
+    centroid = ess.Centroid(range=SAMPLE_RATE / 2.0)
+    mfcc = ess.MFCC(numberCoefficients=13)
+    flux = ess.Flux()
+    rolloff = ess.RollOff(sampleRate=SAMPLE_RATE)
+    flatness = ess.Flatness()
+
+    vector_input.data >> frame_cutter.signal
+    frame_cutter.frame >> windowing.frame
+    windowing.frame >> spectrum.frame
+    spectrum.spectrum >> centroid.array
+    centroid.centroid >> (pool, "centroid")
+    spectrum.spectrum >> mfcc.spectrum
+    mfcc.bands >> None
+    mfcc.mfcc >> (pool, "mfcc")
+    spectrum.spectrum >> flux.spectrum
+    flux.flux >> (pool, "flux")
+    spectrum.spectrum >> rolloff.spectrum
+    rolloff.rollOff >> (pool, "rolloff")
+    spectrum.spectrum >> flatness.array
+    flatness.flatness >> (pool, "flatness")
+
+    core.run(vector_input)
+
+    result: dict = {}
+    if "centroid" in pool.descriptorNames():
+        result["spectral_centroid"] = float(np.mean(pool["centroid"]))
+    if "mfcc" in pool.descriptorNames():
+        mfcc_frames = pool["mfcc"]
+        # np.add.reduce skips np.mean's wrapping/promotion dance and
+        # accumulates in float64, avoiding float32 cancellation.
+        mean_mfcc = np.add.reduce(mfcc_frames, axis=0, dtype=np.float64) * (
+            1.0 / len(mfcc_frames)
+        )
+        result["mfcc"] = mean_mfcc.tolist()
+    if "flux" in pool.descriptorNames():
+        result["spectral_flux"] = float(np.mean(pool["flux"]))
+    if "rolloff" in pool.descriptorNames():
+        result["spectral_rolloff"] = float(np.mean(pool["rolloff"]))
+    if "flatness" in pool.descriptorNames():
+        result["spectral_flatness"] = float(np.mean(pool["flatness"]))
+    return result
+
+
+def _run_peak_rms(audio: np.ndarray) -> tuple[float, float]:
+    """Return (peak, rms) from one pass over the signal."""
+    if NUMBA_AVAILABLE:
+        peak, rms = peak_rms(audio)
+        return float(peak), float(rms)
+    peak, rms = peak_rms_numpy(audio)
+    return peak, rms
+
+
+def _run_centroid(audio: np.ndarray) -> float:
+    _, es, _ = _load_essentia()
+    centroid = _algo(
+        "centroid", lambda: es.SpectralCentroidTime(sampleRate=SAMPLE_RATE)
+    )
+    return float(centroid(audio))
+
+
+def _run_frame_features(audio: np.ndarray) -> dict | None:
+    S, n_frames = _extract_frames(audio)
+    if not n_frames:
+        return None
+    flux_mean, rolloff_mean, flatness_mean = spec_shape_means(S, SAMPLE_RATE)
+    result = {
+        "mfcc": _mfcc_from_spectrogram(S),
+        "spectral_flux": float(flux_mean),
+        "spectral_rolloff": float(rolloff_mean),
+        "spectral_flatness": float(flatness_mean),
+    }
+    if USE_FUSED_CENTROID:
+        # Magnitude-weighted mean frequency per frame, straight off the
+        # spectrogram — no extra pass over the PCM.
+        freqs = rfftfreqs(MFCC_FRAME_SIZE, SAMPLE_RATE)
+        centroid = (S @ freqs) / S.sum(axis=1).clip(min=1e-12)
+        result["spectral_centroid"] = float(centroid.mean())
+    return result
+
+
+def _run_envelope(audio: np.ndarray) -> list[float] | None:
+    """Vectorized RMS envelope over 1024-sample frames with a 512 hop.
+
+    sliding_window_view frames the buffer without copying, and einsum
+    computes each frame's energy without materialising a squared
+    temporary, so the whole envelope comes out of one NumPy pass instead
+    of a Python loop per frame.
+    """
+    if audio.size < ENVELOPE_FRAME_SIZE:
+        return None
+    frames = np.lib.stride_tricks.sliding_window_view(audio, ENVELOPE_FRAME_SIZE)[
+        ::ENVELOPE_HOP_SIZE
+    ]
+    env = np.sqrt(np.einsum("ij,ij->i", frames, frames) / ENVELOPE_FRAME_SIZE)
+    return env.astype(np.float32).tolist()
+
+
+def _run_bpm(audio: np.ndarray) -> float:
+    _, es, _ = _load_essentia()
+    rhythm = _algo("rhythm", lambda: es.RhythmExtractor2013(method="multifeature"))
+    bpm, _, _, _, _ = rhythm(audio)
+    return float(bpm)
+
 
+def _run_key(audio: np.ndarray) -> tuple[str, float]:
+    _, es, _ = _load_essentia()
+    key, scale, strength = _algo("key", es.KeyExtractor)(audio)
+    return f"{key} {scale}", float(strength)
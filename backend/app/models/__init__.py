@@ -1,7 +1,7 @@
 """Database models package for Brain Jelly."""
 
-from .audio_features import AudioFeature
+from .audio_features import AudioFeature, bulk_upsert_features
 from .similarity_score import SimilarityScore
 from .track import Track
 
-__all__ = ["Track", "AudioFeature", "SimilarityScore"]
+__all__ = ["Track", "AudioFeature", "SimilarityScore", "bulk_upsert_features"]
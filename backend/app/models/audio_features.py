@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from backend.app.extensions import db
 
 
@@ -20,7 +22,10 @@ class AudioFeature(db.Model):
     spectral_centroid = db.Column(db.Float, nullable=True)
     rms = db.Column(db.Float, nullable=True)
     peak_amplitude = db.Column(db.Float, nullable=True)
-    mfcc = db.Column(db.JSON, nullable=True)
+    # Native float arrays instead of JSON: no text parse on read, and
+    # SQL-side vector operations stay possible for similarity work.
+    mfcc = db.Column(db.ARRAY(db.Float), nullable=True)
+    rms_envelope = db.Column(db.ARRAY(db.Float), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -33,7 +38,10 @@ class AudioFeature(db.Model):
             "spectral_centroid": self.spectral_centroid,
             "rms": self.rms,
             "peak_amplitude": self.peak_amplitude,
-            "mfcc": self.mfcc,
+            "mfcc": list(self.mfcc) if self.mfcc is not None else None,
+            "rms_envelope": (
+                list(self.rms_envelope) if self.rms_envelope is not None else None
+            ),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
@@ -41,3 +49,27 @@ class AudioFeature(db.Model):
     def __repr__(self) -> str:
         return f"<AudioFeature track_id={self.track_id}>"
 
+
+def bulk_upsert_features(session, rows: list[dict]) -> None:
+    """Insert or refresh many feature rows in one statement.
+
+    ``rows`` holds column dicts keyed by ``track_id``. One Postgres
+    ``INSERT ... ON CONFLICT DO UPDATE`` replaces a flush of per-row
+    INSERTs (and re-extraction just overwrites the old row), so batch
+    ingests cost one round-trip instead of one per file. The caller
+    owns the transaction.
+    """
+    if not rows:
+        return
+    stmt = pg_insert(AudioFeature).values(rows)
+    set_ = {
+        name: stmt.excluded[name]
+        for name in rows[0]
+        if name not in ("id", "track_id")
+    }
+    # Column-level onupdate doesn't fire through ON CONFLICT DO UPDATE,
+    # so stamp updated_at explicitly or refreshed rows keep a stale one.
+    set_["updated_at"] = datetime.utcnow()
+    stmt = stmt.on_conflict_do_update(index_elements=["track_id"], set_=set_)
+    session.execute(stmt)
+
@@ -29,6 +29,9 @@ class SimilarityScore(db.Model):
             "target_track_id",
             name="uq_similarity_source_target",
         ),
+        # Serves the "top N similar for a track" query as an index-only
+        # scan: filter on source, already sorted by score.
+        db.Index("ix_sim_source_score", "source_track_id", score.desc()),
     )
 
     def to_dict(self) -> dict:
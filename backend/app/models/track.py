@@ -38,6 +38,11 @@ class Track(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    __table_args__ = (
+        # Keyset pagination on /tracks walks (created_at, id) descending.
+        db.Index("ix_tracks_created_id", created_at.desc(), id.desc()),
+    )
+
     def to_dict(self) -> dict:
         """Serialize the track for API responses."""
         return {
@@ -1,15 +1,22 @@
 """Upload endpoints for Brain Jelly."""
 
 import logging
+import shutil
 from pathlib import Path
 from uuid import uuid4
 
 from flask import Blueprint, jsonify, request
 
-from backend.app.audio import AudioLoaderError, load_audio
+from backend.app.audio import looks_like_audio
 from backend.app.extensions import db
 from backend.app.models import Track
-from backend.app.tasks.tasks import process_audio
+from celery import chain
+
+from backend.app.tasks.tasks import (
+    compute_similarity_for_track,
+    extract_features,
+    process_audio,
+)
 
 upload_bp = Blueprint("upload", __name__)
 logger = logging.getLogger(__name__)
@@ -18,6 +25,10 @@ logger = logging.getLogger(__name__)
 UPLOAD_DIR = Path(__file__).resolve().parents[2] / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Copy buffer for streaming uploads to disk; 1 MiB keeps the copy in
+# large kernel-friendly chunks instead of Werkzeug's small default.
+UPLOAD_COPY_BUFFER = 1 << 20
+
 
 @upload_bp.post("/upload")
 def upload_track():
@@ -33,38 +44,28 @@ def upload_track():
     track_dir = UPLOAD_DIR / track_id
     track_dir.mkdir(exist_ok=True)
 
-    # Save the file
+    # Stream the upload to disk in large blocks rather than letting
+    # FileStorage.save copy through its small default buffer.
     original_filename = audio_file.filename
     saved_file_path = track_dir / original_filename
-    audio_file.save(str(saved_file_path))
+    with open(saved_file_path, "wb") as destination:
+        shutil.copyfileobj(audio_file.stream, destination, UPLOAD_COPY_BUFFER)
 
-    # Validate audio decoding before persisting
-    try:
-        load_audio(str(saved_file_path))
-    except AudioLoaderError as exc:
-        logger.warning("Upload failed audio validation for %s: %s", saved_file_path, exc)
+    # Header-only validation: a full decode here would hold the web
+    # worker for seconds, and process_audio decodes (and marks decode
+    # failures on the track) anyway.
+    if not looks_like_audio(saved_file_path):
+        logger.warning("Upload failed audio sniff for %s", saved_file_path)
         saved_file_path.unlink(missing_ok=True)
         return (
             jsonify(
                 {
                     "success": False,
-                    "error": f"Unable to process audio file: {exc}",
+                    "error": "File does not look like a supported audio format.",
                 }
             ),
             400,
         )
-    except Exception as exc:  # noqa: broad-except
-        logger.exception("Unexpected error validating upload %s", saved_file_path)
-        saved_file_path.unlink(missing_ok=True)
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": "Unexpected error while validating audio upload.",
-                }
-            ),
-            500,
-        )
 
     # Persist track metadata
     track = Track(
@@ -76,8 +77,16 @@ def upload_track():
     db.session.add(track)
     db.session.commit()
 
-    # Dispatch Celery task
-    process_audio.delay(track_id, str(saved_file_path))
+    # Dispatch the whole pipeline as an explicit chain; the decode task
+    # writes a waveform sidecar the extraction task reuses, and failed
+    # stages abort the rest of the chain.
+    chain(
+        process_audio.s(track_id, str(saved_file_path)),
+        extract_features.si(track_id, str(saved_file_path)),
+        compute_similarity_for_track.si(track_id),
+    ).apply_async()
 
-    return jsonify({"success": True, "data": {"track_id": track_id}})
+    # Processing continues in the worker; poll the track status
+    # endpoint for decode errors and progress.
+    return jsonify({"success": True, "data": {"track_id": track_id}}), 202
 
@@ -0,0 +1,80 @@
+"""In-memory feature matrix for similarity scoring."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from backend.app.models import AudioFeature
+
+
+class FeatureCache:
+    """Process-local (N, 3) float32 matrix of scalar features plus ids.
+
+    Loaded lazily from the database on first use in each worker process
+    and updated in place as new features land, so scoring a new upload
+    costs one vectorized kernel over a resident matrix instead of
+    re-reading every row from SQL. The cache is per-process: rows
+    written by other workers after the initial load appear the next
+    time a process starts fresh.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._matrix = np.empty((0, 3), dtype=np.float32)
+        self._loaded = False
+
+    def _load_locked(self, session) -> None:
+        rows = (
+            session.query(
+                AudioFeature.track_id,
+                AudioFeature.rms,
+                AudioFeature.spectral_centroid,
+                AudioFeature.peak_amplitude,
+            )
+            .filter(
+                AudioFeature.rms.isnot(None),
+                AudioFeature.spectral_centroid.isnot(None),
+                AudioFeature.peak_amplitude.isnot(None),
+            )
+            .all()
+        )
+        self._ids = [row[0] for row in rows]
+        self._index = {track_id: i for i, track_id in enumerate(self._ids)}
+        if rows:
+            self._matrix = np.array([row[1:] for row in rows], dtype=np.float32)
+        else:
+            self._matrix = np.empty((0, 3), dtype=np.float32)
+        self._loaded = True
+
+    def upsert(self, track_id: str, rms, spectral_centroid, peak_amplitude) -> None:
+        """Add or refresh one track's row after its features commit."""
+        if rms is None or spectral_centroid is None or peak_amplitude is None:
+            return
+        with self._lock:
+            if not self._loaded:
+                # First snapshot will pick the row up from SQL anyway.
+                return
+            row = np.array(
+                [rms, spectral_centroid, peak_amplitude], dtype=np.float32
+            )
+            position = self._index.get(track_id)
+            if position is None:
+                self._index[track_id] = len(self._ids)
+                self._ids.append(track_id)
+                self._matrix = np.vstack([self._matrix, row[np.newaxis]])
+            else:
+                self._matrix[position] = row
+
+    def snapshot(self, session):
+        """Return (ids array, matrix copy), loading from SQL on first call."""
+        with self._lock:
+            if not self._loaded:
+                self._load_locked(session)
+            return np.array(self._ids), self._matrix.copy()
+
+
+feature_cache = FeatureCache()
@@ -2,21 +2,199 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 
 from backend.app.audio import AudioLoaderError, load_audio
-from backend.app.audio.essentia_extraction import ESSENTIA_AVAILABLE, essentia_extraction
+from backend.app.audio._fft import fast_len, rfft_long, rfftfreqs
+from backend.app.audio._spec_kernels import (
+    NUMBA_AVAILABLE,
+    ROCKET_FFT_AVAILABLE,
+    framed_centroid,
+    peak_rms,
+    peak_rms_numpy,
+)
+from backend.app.audio.essentia_extraction import (
+    essentia_available,
+    essentia_extraction,
+    essentia_extraction_batch,
+)
 from backend.app.extensions import db
+from backend.app.tasks.feature_cache import feature_cache
 from backend.app.models import AudioFeature, Track
 from backend.celery_app import celery
-from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+try:
+    import cupy
+
+    CUPY_AVAILABLE = cupy.cuda.runtime.getDeviceCount() > 0
+except Exception:  # noqa: broad-except - no cupy, or no usable device
+    cupy = None
+    CUPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Below this length the host<->device transfer costs more than the FFT
+# saves; roughly 1.5 minutes of 44.1 kHz mono.
+GPU_FFT_MIN_SAMPLES = 1 << 22
+
+# Framed-STFT parameters for the fallback centroid. Power-of-two frames
+# hit pocketfft/FFTW's radix-2/4 SIMD kernels; a waveform-length FFT
+# lands on whatever factorization the track duration happens to have.
+CENTROID_FRAME_SIZE = 2048
+CENTROID_HOP_SIZE = 512
+
+@lru_cache(maxsize=16)
+def _hann(n: int) -> np.ndarray:
+    """Cached, read-only float32 Hann window of length n."""
+    window = np.hanning(n).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+# Rows per INSERT batch when writing similarity scores.
+SIMILARITY_INSERT_CHUNK = 10_000
+
+# Shared session registry for tasks that manage their own transactions.
+# expire_on_commit=False keeps committed instances readable without a
+# refresh SELECT. The bind is attached lazily because db.engine needs an
+# app context, which exists once tasks actually run.
+_task_session_factory = sessionmaker(expire_on_commit=False)
+TaskSession = scoped_session(_task_session_factory)
+
+
+def _task_session():
+    """Return the scoped task session, binding the engine on first use."""
+    if _task_session_factory.kw.get("bind") is None:
+        TaskSession.configure(bind=db.engine)
+    return TaskSession()
+
+
+# Decoded-waveform cache written by process_audio: mono float32 samples
+# stored under a content-derived key, shared across tracks, so retries
+# and re-uploads of the same file memmap the samples instead of paying
+# the decode again.
+WAVEFORM_CACHE_DIR = Path(__file__).resolve().parents[2] / "uploads" / "_cache"
+
+# Chunk size for the pre-3.11 hashing fallback.
+_SHA_CHUNK_BYTES = 1 << 20
+
+
+def _file_sha256(path: str | Path) -> str:
+    """Hex SHA-256 of a file's full contents.
+
+    hashlib.file_digest (3.11+) streams through OpenSSL's SHA-NI
+    implementation at multiple GB/s, so hashing whole uploads costs
+    milliseconds against the seconds a decode takes; older runtimes
+    fall back to a chunked read.
+    """
+    with open(path, "rb") as fh:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := fh.read(_SHA_CHUNK_BYTES):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _waveform_cache_key(track_path: str | Path) -> str | None:
+    """Content key for the waveform cache: full-file SHA-256.
+
+    Hashing the whole file (cheap — see _file_sha256) makes the key
+    exact: byte-identical uploads share one cache entry regardless of
+    filename or timestamps, and any change to the file changes the key,
+    so a replaced upload misses and re-decodes with no freshness check
+    at load time.
+    """
+    try:
+        return _file_sha256(track_path)
+    except OSError:
+        return None
+
+
+def _waveform_cache_path(track_path: str | Path) -> Path | None:
+    key = _waveform_cache_key(track_path)
+    if key is None:
+        return None
+    return WAVEFORM_CACHE_DIR / f"{key}.npy"
+
+
+def _load_cached_waveform(track_path: str | Path) -> np.ndarray | None:
+    """Memmap the cached waveform for this file, or None on a miss."""
+    cache_path = _waveform_cache_path(track_path)
+    if cache_path is None:
+        return None
+    try:
+        return np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+def _spectral_centroid(waveform, samplerate) -> float:
+    """Mean magnitude-weighted frequency over Hann-windowed frames."""
+    if CUPY_AVAILABLE and waveform.size >= GPU_FFT_MIN_SAMPLES:
+        try:
+            return _spectral_centroid_gpu(waveform, samplerate)
+        except Exception:  # noqa: broad-except
+            logger.exception("GPU centroid failed; falling back to CPU")
+
+    if waveform.size < CENTROID_FRAME_SIZE:
+        # Too short to frame; one small transform of the whole signal,
+        # zero-padded onto a smooth length so an awkward sample count
+        # doesn't hit pocketfft's slow generic path. The padding only
+        # interpolates the spectrum, so the magnitude-weighted centroid
+        # is unchanged within float tolerance.
+        nfast = fast_len(waveform.size)
+        spectrum = np.abs(rfft_long(np.asarray(waveform), n=nfast))
+        total = spectrum.sum()
+        if total <= 0.0:
+            return 0.0
+        return float((spectrum @ rfftfreqs(nfast, samplerate)) / total)
+
+    if ROCKET_FFT_AVAILABLE:
+        # Fully fused JIT path: windowing, FFT, magnitude and the
+        # weighted reduction happen inside one parallel kernel, so
+        # neither the frame matrix nor the spectrogram is allocated.
+        return float(
+            framed_centroid(
+                np.ascontiguousarray(waveform, dtype=np.float32),
+                CENTROID_FRAME_SIZE,
+                CENTROID_HOP_SIZE,
+                _hann(CENTROID_FRAME_SIZE),
+                rfftfreqs(CENTROID_FRAME_SIZE, samplerate),
+            )
+        )
+
+    frames = (
+        np.lib.stride_tricks.sliding_window_view(waveform, CENTROID_FRAME_SIZE)[
+            ::CENTROID_HOP_SIZE
+        ]
+        * _hann(CENTROID_FRAME_SIZE)
+    )
+    S = np.abs(rfft_long(frames, axis=1))
+    freqs = rfftfreqs(CENTROID_FRAME_SIZE, samplerate)
+    totals = S.sum(axis=1)
+    np.clip(totals, 1e-12, None, out=totals)
+    return float(((S @ freqs) / totals).mean())
+
+
+def _spectral_centroid_gpu(waveform, samplerate) -> float:
+    """cupy path for long tracks; one transfer, transform stays on device."""
+    device_wave = cupy.asarray(np.ascontiguousarray(waveform))
+    magnitude = cupy.abs(cupy.fft.rfft(device_wave))
+    total = magnitude.sum()
+    if float(total) <= 0.0:
+        return 0.0
+    freqs = cupy.fft.rfftfreq(device_wave.size, 1.0 / samplerate)
+    return float((magnitude @ freqs) / total)
+
+
 @celery.task(name="ping")
 def ping():
     """Lightweight ping task for Celery health checks."""
@@ -32,60 +210,94 @@ def add(x: int, y: int) -> int:
 @celery.task(bind=True)
 def process_audio(self, track_id: str, file_path: str) -> dict:
     """Load audio file and extract basic metadata."""
-    with current_app.app_context():
-        try:
-            file_path_obj = Path(file_path)
-            waveform, samplerate = load_audio(file_path_obj)
-            duration = waveform.size / float(samplerate)
-
-            logger.info(
-                "Decoded track %s (%s): samplerate=%s, duration=%.2fs",
-                track_id,
-                file_path,
-                samplerate,
-                duration,
-            )
+    try:
+        file_path_obj = Path(file_path)
+        waveform, samplerate = load_audio(file_path_obj)
+        duration = waveform.size / float(samplerate)
 
-            track_data = _update_track_record(
-                track_id,
-                status="loaded",
-                samplerate=int(samplerate) if samplerate is not None else None,
-                duration=duration,
-                error_message=None,
-            )
-            extract_features.delay(track_id, file_path)
-            db.session.commit()
-            return track_data
-        except AudioLoaderError as exc:
-            logger.warning(
-                "process_audio failed to decode %s (%s): %s",
-                track_id,
-                file_path,
-                exc,
-            )
-            db.session.rollback()
-            return _handle_processing_error(track_id, exc)
-        except Exception as exc:  # noqa: broad-except
-            logger.exception("Unexpected error decoding %s: %s", track_id, exc)
-            db.session.rollback()
-            raise
-        finally:
-            db.session.remove()
-
-
-def basic_extraction(track_path):
-    """Extract basic audio features from a track file."""
-    waveform, samplerate = load_audio(track_path)
+        cache_path = _waveform_cache_path(file_path_obj)
+        if cache_path is not None:
+            try:
+                WAVEFORM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                np.save(cache_path, waveform.astype(np.float32, copy=False))
+            except OSError:
+                logger.warning(
+                    "Could not write waveform cache for %s",
+                    track_id,
+                    exc_info=True,
+                )
 
-    rms = float(np.sqrt(np.mean(waveform**2)))
-    spectral_centroid = float(np.mean(np.abs(np.fft.rfft(waveform))))
-    peak_amplitude = float(np.max(np.abs(waveform)))
+        logger.info(
+            "Decoded track %s (%s): samplerate=%s, duration=%.2fs",
+            track_id,
+            file_path,
+            samplerate,
+            duration,
+        )
+
+        # One transaction: _update_track_record issues the UPDATE and
+        # commits. extract_features follows via the Celery chain the
+        # upload handler dispatched.
+        track_data = _update_track_record(
+            track_id,
+            status="loaded",
+            samplerate=int(samplerate) if samplerate is not None else None,
+            duration=duration,
+            error_message=None,
+        )
+        return track_data
+    except AudioLoaderError as exc:
+        logger.warning(
+            "process_audio failed to decode %s (%s): %s",
+            track_id,
+            file_path,
+            exc,
+        )
+        db.session.rollback()
+        # Stop the chain: there is nothing for extract_features to do
+        # with an undecodable file.
+        self.request.chain = None
+        return _handle_processing_error(track_id, exc)
+    except Exception as exc:  # noqa: broad-except
+        logger.exception("Unexpected error decoding %s: %s", track_id, exc)
+        db.session.rollback()
+        raise
+
+
+def basic_extraction(track_path, samplerate=None):
+    """Extract basic audio features from a track file.
+
+    When process_audio already decoded the file, its float32 waveform
+    sidecar is memmapped instead of decoding a second time; pass the
+    known samplerate to enable that path.
+    """
+    if essentia_available():
+        features = essentia_extraction(track_path)
+        # essentia_extraction returns {} for formats it won't handle
+        # (anything non-WAV) and for decode failures; fall through to
+        # the NumPy path instead of handing callers an empty dict.
+        if features:
+            return features
+
+    waveform = None
+    if samplerate is not None:
+        waveform = _load_cached_waveform(track_path)
+    if waveform is None:
+        waveform, samplerate = load_audio(track_path)
+
+    if NUMBA_AVAILABLE:
+        # Fused single pass: the waveform dominates memory traffic, so
+        # peak and RMS come out of one walk over the buffer.
+        peak, rms_value = peak_rms(waveform)
+        peak_amplitude = float(peak)
+        rms = float(rms_value)
+    else:
+        peak_amplitude, rms = peak_rms_numpy(waveform)
+
+    spectral_centroid = _spectral_centroid(waveform, samplerate)
 
     mfcc = [0.0] * 13  # placeholder
 
-    if ESSENTIA_AVAILABLE:
-        return essentia_extraction(track_path)
-
     return {
         "spectral_centroid": spectral_centroid,
         "rms": rms,
@@ -98,138 +310,278 @@ def basic_extraction(track_path):
 
 
 @celery.task(bind=True)
-def extract_features(self, track_id, track_path):
-    from backend.app.models import Track, AudioFeature
+def extract_features(self, track_id, track_path, force=False):
+    from backend.app.models import Track, AudioFeature, bulk_upsert_features
+
+    session = _task_session()
+    try:
+        # Duplicate enqueues and task retries are common; an indexed
+        # SELECT on track_id is far cheaper than re-decoding and
+        # re-running the FFTs, so return the stored row unless the
+        # caller explicitly forces recomputation.
+        if not force:
+            existing = (
+                session.query(
+                    AudioFeature.id,
+                    AudioFeature.track_id,
+                    AudioFeature.spectral_centroid,
+                    AudioFeature.rms,
+                    AudioFeature.peak_amplitude,
+                    AudioFeature.mfcc,
+                )
+                .filter_by(track_id=track_id)
+                .first()
+            )
+            if existing is not None:
+                return {
+                    "id": existing.id,
+                    "track_id": existing.track_id,
+                    "spectral_centroid": existing.spectral_centroid,
+                    "rms": existing.rms,
+                    "peak_amplitude": existing.peak_amplitude,
+                    "mfcc": existing.mfcc,
+                    "cached": True,
+                }
+
+        # Projection only — the samplerate feeds the waveform-cache
+        # fast path, and nothing else from the row is needed.
+        track_row = (
+            session.query(Track.id, Track.samplerate)
+            .filter_by(id=track_id)
+            .first()
+        )
+        if track_row is None:
+            self.request.chain = None
+            return {"error": "Track not found"}
 
-    with current_app.app_context():
-        Session = scoped_session(sessionmaker(bind=db.engine))
-        session = Session()
         try:
-            track = session.query(Track).get(track_id)
-            if not track:
-                return {"error": "Track not found"}
-
-            try:
-                features = basic_extraction(track_path)
-            except AudioLoaderError as exc:
-                track.status = "error"
-                track.error_message = str(exc)
-                session.commit()
-                return {"error": str(exc)}
-
-            audio_feature = AudioFeature(
-                track_id=track_id,
-                rms=features["rms"],
-                spectral_centroid=features["spectral_centroid"],
-                peak_amplitude=features["peak_amplitude"],
-                mfcc=features["mfcc"],
-                bpm=features["bpm"],
-                key=features["key"],
-                key_strength=features["key_strength"],
+            features = basic_extraction(track_path, samplerate=track_row.samplerate)
+        except AudioLoaderError as exc:
+            session.execute(
+                update(Track)
+                .where(Track.id == track_id)
+                .values(status="error", error_message=str(exc))
             )
-            session.add(audio_feature)
+            session.commit()
+            self.request.chain = None
+            return {"error": str(exc)}
+
+        # Upsert rather than INSERT: with force=True a feature row
+        # already exists, and a plain add() would trip the track_id
+        # unique constraint in exactly the case force is for.
+        bulk_upsert_features(
+            session,
+            [
+                {
+                    "track_id": track_id,
+                    "rms": features["rms"],
+                    "spectral_centroid": features["spectral_centroid"],
+                    "peak_amplitude": features["peak_amplitude"],
+                    "mfcc": features["mfcc"],
+                    "rms_envelope": features.get("rms_envelope"),
+                    "bpm": features["bpm"],
+                    "key": features["key"],
+                    "key_strength": features["key_strength"],
+                }
+            ],
+        )
+
+        session.execute(
+            update(Track)
+            .where(Track.id == track_id)
+            .values(status="features_ready")
+        )
+
+        response = {
+            "id": session.query(AudioFeature.id)
+            .filter_by(track_id=track_id)
+            .scalar(),
+            "track_id": track_id,
+            "spectral_centroid": features["spectral_centroid"],
+            "rms": features["rms"],
+            "peak_amplitude": features["peak_amplitude"],
+            "mfcc": features["mfcc"],
+        }
 
-            track.status = "features_ready"
+        session.commit()
 
-            response = {
-                "id": audio_feature.id,
-                "track_id": audio_feature.track_id,
-                "spectral_centroid": audio_feature.spectral_centroid,
-                "rms": audio_feature.rms,
-                "peak_amplitude": audio_feature.peak_amplitude,
-                "mfcc": audio_feature.mfcc,
-            }
+        feature_cache.upsert(
+            track_id,
+            features["rms"],
+            features["spectral_centroid"],
+            features["peak_amplitude"],
+        )
 
-            session.commit()
+        # Similarity follows as the next link in the upload chain.
+        return response
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        TaskSession.remove()
 
-            # Trigger similarity generation for this track
+
+@celery.task(bind=True)
+def extract_features_batch(self, track_specs):
+    """Extract features for many tracks in one worker pass.
+
+    ``track_specs`` is a list of ``(track_id, track_path)`` pairs.
+    Batching lets the extraction pool amortise Essentia imports and
+    cached filterbanks across files instead of paying the setup cost
+    once per Celery task.
+    """
+    from backend.app.models import Track, bulk_upsert_features
+
+    if not track_specs:
+        return {"processed": 0}
+
+    track_ids = [spec[0] for spec in track_specs]
+    paths = [spec[1] for spec in track_specs]
+
+    if essentia_available():
+        feature_dicts = essentia_extraction_batch(paths)
+    else:
+        feature_dicts = [basic_extraction(path) for path in paths]
+
+    session = _task_session()
+    try:
+        rows = []
+        done_ids = []
+        for track_id, features in zip(track_ids, feature_dicts):
+            if not features:
+                continue
+            rows.append(
+                {
+                    "track_id": track_id,
+                    "rms": features["rms"],
+                    "spectral_centroid": features["spectral_centroid"],
+                    "peak_amplitude": features["peak_amplitude"],
+                    "mfcc": features["mfcc"],
+                    "rms_envelope": features.get("rms_envelope"),
+                    "bpm": features["bpm"],
+                    "key": features["key"],
+                    "key_strength": features["key_strength"],
+                }
+            )
+            done_ids.append(track_id)
+
+        bulk_upsert_features(session, rows)
+        if done_ids:
+            session.query(Track).filter(Track.id.in_(done_ids)).update(
+                {"status": "features_ready"}, synchronize_session=False
+            )
+        session.commit()
+        processed = len(rows)
+
+        for row in rows:
+            feature_cache.upsert(
+                row["track_id"],
+                row["rms"],
+                row["spectral_centroid"],
+                row["peak_amplitude"],
+            )
+
+        for track_id in track_ids:
             compute_similarity_for_track.delay(track_id)
 
-            return response
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
-            Session.remove()
+        return {"processed": processed}
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        TaskSession.remove()
 
 
 @celery.task(bind=True)
 def compute_similarity_for_track(self, track_id):
     from backend.app.models import Track, AudioFeature, SimilarityScore
 
-    with current_app.app_context():
-        Session = scoped_session(sessionmaker(bind=db.engine))
-        session = Session()
-        try:
-            source_track = session.query(Track).get(track_id)
-            if source_track is None:
-                return {"error": "missing source track"}
-
-            source_features = source_track.features
-            if source_features is None:
-                return {"error": "No features for source track"}
-
-            source_values = _extract_basic_feature_values(source_features)
-            if source_values is None:
-                return {"error": "Incomplete source features"}
-
-            # Clear old scores
-            session.query(SimilarityScore).filter_by(source_track_id=track_id).delete()
-
-            target_vectors = []
-            all_features = session.query(AudioFeature).all()
-            computed = 0
-
-            for target in all_features:
-                if target.track_id == track_id:
-                    continue
-
-                target_values = _extract_basic_feature_values(target)
-                if target_values is None:
-                    continue
-
-                target_vectors.append(
-                    {
-                        "track_id": target.track_id,
-                        **target_values,
-                    }
+    session = _task_session()
+    try:
+        if session.query(Track.id).filter_by(id=track_id).first() is None:
+            return {"error": "missing source track"}
+
+        # Project the three scalars for the source instead of
+        # walking Track -> features and hydrating the whole row
+        # (mfcc/rms_envelope arrays included) for values we ignore.
+        source_row = (
+            session.query(
+                AudioFeature.rms,
+                AudioFeature.spectral_centroid,
+                AudioFeature.peak_amplitude,
+            )
+            .filter_by(track_id=track_id)
+            .one_or_none()
+        )
+        if source_row is None:
+            return {"error": "No features for source track"}
+        if any(value is None for value in source_row):
+            return {"error": "Incomplete source features"}
+
+        # Score against the resident feature matrix instead of
+        # re-reading every row from SQL on each upload; the cache
+        # loads once per worker process and rows are upserted as
+        # features commit.
+        feature_cache.upsert(track_id, *source_row)
+        cached_ids, matrix = feature_cache.snapshot(session)
+
+        computed = 0
+        if cached_ids.size:
+            mask = cached_ids != track_id
+            target_ids = cached_ids[mask].tolist()
+        else:
+            target_ids = []
+
+        if target_ids:
+            values = matrix[mask].astype(np.float64)
+            source_vector = np.array(source_row, dtype=np.float64)
+            # One vectorized pass over contiguous arrays replaces the
+            # per-target Python arithmetic.
+            diff = values - source_vector
+            distances = np.einsum("ij,ij->i", diff, diff)
+
+            rows = [
+                {
+                    "source_track_id": track_id,
+                    "target_track_id": target_id,
+                    "score": score,
+                }
+                for target_id, score in zip(target_ids, distances.tolist())
+            ]
+            # Upsert on the (source, target) unique constraint
+            # instead of DELETE + re-INSERT: one pass over the
+            # index, no window where a track briefly has no scores,
+            # and no WAL churn from rewriting unchanged rows' ids.
+            # onupdate doesn't fire on ON CONFLICT, so updated_at is
+            # set explicitly. Chunked so one huge catalogue doesn't
+            # turn into a single oversized statement.
+            now = datetime.utcnow()
+            for start in range(0, len(rows), SIMILARITY_INSERT_CHUNK):
+                stmt = pg_insert(SimilarityScore).values(
+                    rows[start : start + SIMILARITY_INSERT_CHUNK]
                 )
-
-            for target in target_vectors:
-                dist = float(
-                    (source_values["rms"] - target["rms"]) ** 2
-                    + (
-                        source_values["spectral_centroid"]
-                        - target["spectral_centroid"]
-                    )
-                    ** 2
-                    + (
-                        source_values["peak_amplitude"]
-                        - target["peak_amplitude"]
+                session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["source_track_id", "target_track_id"],
+                        set_={"score": stmt.excluded.score, "updated_at": now},
                     )
-                    ** 2
                 )
+            computed = len(rows)
 
-                score = SimilarityScore(
-                    source_track_id=track_id,
-                    target_track_id=target["track_id"],
-                    score=dist,
-                )
-                session.add(score)
-                computed += 1
-
-            source_track.has_similarity = True
-            session.commit()
+        session.execute(
+            update(Track)
+            .where(Track.id == track_id)
+            .values(has_similarity=True)
+        )
+        session.commit()
 
-            return {"computed": computed}
-        except Exception as exc:
-            session.rollback()
-            logger.exception("compute_similarity_for_track failed: %s", exc)
-            raise
-        finally:
-            session.close()
-            Session.remove()
+        return {"computed": computed}
+    except Exception as exc:
+        session.rollback()
+        logger.exception("compute_similarity_for_track failed: %s", exc)
+        raise
+    finally:
+        TaskSession.remove()
 
 
 def _update_track_record(
@@ -239,26 +591,31 @@ def _update_track_record(
     duration: float | None,
     error_message: str | None,
 ) -> dict:
-    """Persist track metadata updates and return a response dict."""
-    track = Track.query.get(track_id)
-    if track is None:
-        return {
-            "track_id": track_id,
-            "status": status,
-            "samplerate": samplerate,
-            "duration": duration,
-            "error_message": error_message,
-        }
-
-    track.status = status
-    track.samplerate = samplerate
-    track.duration = duration
-    track.error_message = error_message
-
+    """Persist track metadata updates and return a response dict.
+
+    Uses a Core UPDATE instead of hydrating the row through the ORM:
+    the task already knows every value it is writing, so there is
+    nothing to read back.
+    """
+    db.session.execute(
+        update(Track)
+        .where(Track.id == track_id)
+        .values(
+            status=status,
+            samplerate=samplerate,
+            duration=duration,
+            error_message=error_message,
+        )
+    )
     db.session.commit()
 
-    data = track.to_dict()
-    return data
+    return {
+        "track_id": track_id,
+        "status": status,
+        "samplerate": samplerate,
+        "duration": duration,
+        "error_message": error_message,
+    }
 
 
 def _handle_processing_error(track_id: str, exc: Exception) -> dict:
@@ -275,80 +632,41 @@ def _handle_processing_error(track_id: str, exc: Exception) -> dict:
 
 def _set_track_error(track_id: str, message: str) -> dict:
     """Set track status to error."""
-    track = Track.query.get(track_id)
-    if track:
-        track.status = "error"
-        track.error_message = message
-        db.session.commit()
+    db.session.execute(
+        update(Track)
+        .where(Track.id == track_id)
+        .values(status="error", error_message=message)
+    )
+    db.session.commit()
     return {"status": "error", "message": message, "track_id": track_id}
 
 
 # --- Similarity helpers ---------------------------------------------------- #
 
-def _build_feature_vector(feature: AudioFeature) -> dict | None:
-    """Return a dictionary of feature values if all required fields exist."""
-    if (
-        feature.rms is None
-        or feature.spectral_centroid is None
-        or feature.peak_amplitude is None
-    ):
-        return None
-
-    if not isinstance(feature.mfcc, (list, tuple)):
-        return None
-
-    mfcc = np.asarray(feature.mfcc, dtype=np.float32)
-    if mfcc.size == 0:
-        return None
-
-    return {
-        "rms": float(feature.rms),
-        "spectral_centroid": float(feature.spectral_centroid),
-        "peak_amplitude": float(feature.peak_amplitude),
-        "mfcc": mfcc,
-    }
-
-
-def _calculate_distance(source: dict, target: dict) -> float:
-    """Weighted Euclidean distance between two feature vectors."""
-    weights = {
-        "rms": 1.0,
-        "spectral_centroid": 1.0,
-        "peak_amplitude": 1.0,
-        "mfcc": 0.5,
-    }
-
-    total = 0.0
-
-    total += weights["rms"] * (source["rms"] - target["rms"]) ** 2
-    total += weights["spectral_centroid"] * (
-        source["spectral_centroid"] - target["spectral_centroid"]
-    ) ** 2
-    total += weights["peak_amplitude"] * (
-        source["peak_amplitude"] - target["peak_amplitude"]
-    ) ** 2
-
-    src_mfcc = source["mfcc"]
-    tgt_mfcc = target["mfcc"]
-    length = min(src_mfcc.size, tgt_mfcc.size)
-    if length:
-        diff = src_mfcc[:length] - tgt_mfcc[:length]
-        total += weights["mfcc"] * float(np.sum(diff**2))
-
-    return float(np.sqrt(total))
-
-
-def _extract_basic_feature_values(feature: AudioFeature) -> dict | None:
-    if (
-        feature.rms is None
-        or feature.spectral_centroid is None
-        or feature.peak_amplitude is None
-    ):
-        return None
-
-    return {
-        "rms": float(feature.rms),
-        "spectral_centroid": float(feature.spectral_centroid),
-        "peak_amplitude": float(feature.peak_amplitude),
-    }
-
+# Weight layout for the MFCC-aware distance: [rms, centroid, peak] then
+# 13 MFCC coefficients. Stored as square roots so scaling the columns
+# up front makes the plain squared difference already weighted.
+_DISTANCE_WEIGHTS_SQRT = np.sqrt(
+    np.array([1.0, 1.0, 1.0] + [0.5] * 13, dtype=np.float32)
+)
+
+
+def _calculate_distances_batch(
+    source_vector: np.ndarray, target_matrix: np.ndarray
+) -> np.ndarray:
+    """Weighted Euclidean distance from one source to every target row.
+
+    ``target_matrix`` is (N, 16) float32 rows laid out like
+    ``_DISTANCE_WEIGHTS_SQRT``. Uses the expansion
+    ``||t - s||^2 = ||t||^2 - 2 t.s + ||s||^2`` so the cross term is a
+    single BLAS matrix-vector product over all targets, instead of a
+    Python-level distance call per row.
+    """
+    weighted_targets = target_matrix * _DISTANCE_WEIGHTS_SQRT
+    weighted_source = source_vector * _DISTANCE_WEIGHTS_SQRT
+    squared = (
+        np.einsum("ij,ij->i", weighted_targets, weighted_targets)
+        - 2.0 * (weighted_targets @ weighted_source)
+        + np.dot(weighted_source, weighted_source)
+    )
+    return np.sqrt(np.clip(squared, 0.0, None))
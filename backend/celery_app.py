@@ -1,6 +1,7 @@
 """Celery application factory for Brain Jelly."""
 
 from celery import Celery
+from celery.signals import worker_process_init
 from flask import Flask
 
 # Create celery instance (will be configured later)
@@ -16,6 +17,36 @@ def create_celery_app(app: Flask) -> Celery:
     celery.conf.broker_url = app.config.get("CELERY_BROKER_URL") or "redis://localhost:6379/0"
     celery.conf.result_backend = app.config.get("CELERY_RESULT_BACKEND") or "redis://localhost:6379/0"
 
+    # CPU-bound decode/FFT work and I/O-bound DB work want different
+    # pool shapes, so they ride separate queues. Run one fleet per
+    # queue, e.g.:
+    #   celery -A celery_worker worker -Q decode -c <cpu_count> --prefetch-multiplier=1
+    #   celery -A celery_worker worker -Q db --pool=gevent -c 100
+    # The db tasks spend their time waiting on SQL round-trips, so a
+    # greenlet pool buys far more concurrency per GB of RAM than
+    # prefork. With gevent, monkey-patch before importing anything
+    # (gevent.monkey.patch_all) and force psycopg's pure-Python
+    # connection (PSYCOPG_IMPL=python) so its socket I/O cooperates
+    # with the event loop; the C implementation blocks the hub.
+    # Unrouted tasks (ping, add) stay on the default queue.
+    celery.conf.task_routes = {
+        "backend.app.tasks.tasks.process_audio": {"queue": "decode"},
+        "backend.app.tasks.tasks.extract_features": {"queue": "decode"},
+        "backend.app.tasks.tasks.extract_features_batch": {"queue": "decode"},
+        "backend.app.tasks.tasks.compute_similarity_for_track": {"queue": "db"},
+    }
+    # Long-running tasks and prefetch don't mix: a worker that prefetches
+    # a batch of decodes starves idle siblings while it churns through
+    # its backlog one by one. Acking late pairs with that — a task a
+    # worker dies holding gets redelivered instead of lost, which is
+    # safe here because every task is idempotent (features and scores
+    # upsert, extract_features short-circuits on existing rows). Start
+    # workers with -Ofair so ready siblings pick up waiting tasks.
+    celery.conf.update(
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+    )
+
     # Auto-discover tasks from backend/app/tasks
     celery.autodiscover_tasks(["backend.app.tasks"])
 
@@ -27,6 +58,28 @@ def create_celery_app(app: Flask) -> Celery:
                 return self.run(*args, **kwargs)
 
     celery.Task = ContextTask
+    celery.flask_app = app
 
     return celery
 
+
+# Module-level, not a closure inside the factory: the signal dispatcher
+# holds receivers weakly, so a nested handler would be garbage-collected
+# as soon as create_celery_app returned and never fire.
+@worker_process_init.connect
+def _dispose_inherited_engine(**_kwargs):
+    """Drop connections inherited from the parent after fork.
+
+    Prefork children would otherwise share the parent's pooled
+    sockets, interleaving protocol traffic from multiple processes
+    on one connection. close=False discards the handles without
+    closing sockets the parent still owns.
+    """
+    from backend.app.extensions import db
+
+    app = getattr(celery, "flask_app", None)
+    if app is None:
+        return
+    with app.app_context():
+        db.engine.dispose(close=False)
+
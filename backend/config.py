@@ -1,3 +1,4 @@
+import functools
 import os
 from pathlib import Path
 
@@ -15,6 +16,9 @@ class BaseConfig:
 
     SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
     TESTING = False
+    # Cap upload size: Werkzeug rejects bigger request bodies with 413
+    # before they can exhaust worker memory or disk.
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
     DEBUG = False
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
 
@@ -26,6 +30,15 @@ class BaseConfig:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
+        # Sized for a prefork Celery worker plus a handful of web
+        # workers per process; pre_ping drops stale connections instead
+        # of surfacing "server closed the connection" mid-task, and
+        # recycle keeps idle connections younger than typical
+        # LB/Postgres idle timeouts.
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
         "execution_options": {
             "prepared_statement_cache_size": 0
         }
@@ -56,6 +69,7 @@ CONFIG_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=4)
 def get_config(env_name: str | None) -> type[BaseConfig]:
     """Return the config class associated with the given environment."""
     if env_name is None:
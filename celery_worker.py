@@ -1,6 +1,15 @@
+import os
+
+# Pin BLAS thread pools before NumPy is imported (importing the app
+# imports it): under prefork each worker process would otherwise spawn
+# a thread per core and concurrent tasks would oversubscribe the CPUs.
+# Parallelism comes from the worker pool, not from BLAS.
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 from backend.app import create_app
 from backend.celery_app import create_celery_app
 
 flask_app = create_app()
 celery = create_celery_app(flask_app)
-